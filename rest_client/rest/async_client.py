@@ -0,0 +1,317 @@
+"""Asynchronous versions of the resource and collection clients, backed by an
+httpx AsyncClient with HTTP/2 enabled. This lets multiple API calls wait on
+the network concurrently, for example using asyncio.gather.
+
+These clients require Python 3.7 or later and the 'async' extra to be
+installed, and can be enabled by setting client_class in a resource/collection
+Meta class. All operations return a coroutine, but otherwise behave like their
+synchronous counterparts.
+
+By default, an httpx AsyncClient is created for every running event loop, as
+an AsyncClient can't be used on a different loop than the one it connected
+on (for example with async_to_sync, which runs a new loop for every call).
+Instead, one can supply an AsyncClient to the client's constructor. In that
+case, the caller owns it and should close it with `await client.aclose()`,
+and it should only be used on a single event loop.
+"""
+import asyncio
+from typing import List, Optional, Tuple
+
+import httpx
+import orjson
+
+from .client import ResourceClient, CollectionClient, _GET_BIT, \
+    _GET_OVER_POST_BIT, _GET_MANY_BIT, _PUT_BIT, _DELETE_BIT
+from .exceptions import OperationNotEnabled
+
+# Shared by all async clients by default. Maps every event loop to its client,
+# and the async generator that closes it (see _close_on_shutdown)
+_loop_clients = {}
+
+
+async def _close_on_shutdown(client: httpx.AsyncClient):
+    """Closes the client once the generator is finalized. Event loops finalize
+    their async generators when shutting down (asyncio.run and async_to_sync
+    both do so), which is the last moment the client's connections can still
+    be closed on the loop they belong to.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _get_loop_client() -> httpx.AsyncClient:
+    """Returns the AsyncClient for the running event loop, creating it if
+    needed. Clients of closed loops are discarded at the same time.
+    """
+    loop = asyncio.get_running_loop()
+
+    entry = _loop_clients.get(loop)
+    if entry is None:
+        # These have been closed by _close_on_shutdown already, unless the
+        # loop was closed without shutting down its async generators. Their
+        # connections can't be closed anymore in that case.
+        for other_loop in list(_loop_clients):
+            if other_loop.is_closed():
+                _loop_clients.pop(other_loop, None)
+
+        client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+
+        # Start the generator, which registers it with the running loop. The
+        # loop only keeps a weak reference, so it's stored with the client.
+        closer = _close_on_shutdown(client)
+        try:
+            closer.asend(None).send(None)
+        except StopIteration:
+            pass
+
+        entry = _loop_clients[loop] = (client, closer)
+
+    return entry[0]
+
+
+def _make_timeout(timeout):
+    """Converts a requests style (connect, read) timeout tuple to an httpx
+    Timeout. Other values are supported by httpx as is.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(None, connect=connect, read=read)
+
+    return timeout
+
+
+class _AsyncClientMixin:
+    """Common code for both async clients"""
+
+    def _init_async(self, session: Optional[httpx.AsyncClient]) -> None:
+        """Replaces the sync defaults set by BaseClient.__init__, which
+        stores the shared requests session if no session was supplied.
+        """
+        self._session = session
+        self._get_method_name = 'get'
+        self._get_body_arg = 'params'
+
+    @property
+    def _http_client(self) -> httpx.AsyncClient:
+        """The supplied AsyncClient, or the one for the running loop"""
+        return self._session or _get_loop_client()
+
+    @_http_client.setter
+    def _http_client(self, value) -> None:
+        self._session = value
+
+    def _configure_get(self, over_post: bool) -> None:
+        """Stores how get requests are sent. Unlike the sync clients, the http
+        method itself can't be stored, as the AsyncClient depends on the
+        running loop.
+        """
+        if over_post:
+            self._get_method_name = 'post'
+            self._get_body_arg = 'data'
+
+    def _get_get_method(self):
+        """Returns the http method for get operations, see _configure_get"""
+        return getattr(self._http_client, self._get_method_name)
+
+    async def _send(self, method, url: str,
+                    **kwargs) -> Tuple[bool, Optional[httpx.Response]]:
+        """Performs a request using one of the http client's methods, with the
+        timeout configured in the Meta class.
+
+        :param method: The http client method to call, like
+        self._http_client.get
+        :param url: The URL to send the request to
+        :param kwargs: Any additional kwargs for the method
+        :return: A tuple of a bool indicating if the request could be sent, and
+        the response (or None if it could not be sent)
+        """
+        try:
+            return True, await method(url, timeout=self._timeout, **kwargs)
+        except httpx.TransportError:
+            return False, None
+
+
+class AsyncResourceClient(_AsyncClientMixin, ResourceClient):
+    """Async API client for resources"""
+
+    def __init__(self, session: httpx.AsyncClient = None):
+        super(AsyncResourceClient, self).__init__(session)
+
+        self._init_async(session)
+
+    def contribute_to_class(self, cls, name) -> None:
+        """This configures the client to the specific resource class"""
+        super(AsyncResourceClient, self).contribute_to_class(cls, name)
+
+        self._timeout = _make_timeout(self._timeout)
+
+    async def get(self, **kwargs):
+        """See ResourceClient.get"""
+        if not self._ops_mask & (_GET_BIT | _GET_OVER_POST_BIT):
+            raise OperationNotEnabled
+
+        url, kwargs = self._make_url(kwargs)
+
+        sent, request = await self._send(
+            self._get_get_method(),
+            url,
+            headers=self._get_auth_headers(),
+            **{self._get_body_arg: kwargs}
+        )
+        if not sent:
+            return None
+
+        if not request.is_success:
+            self._handle_api_error(request)
+
+        return self._build_resource(orjson.loads(request.content))
+
+    async def get_many(self, ids, **kwargs) -> List:
+        """See ResourceClient.get_many. Without a batch_path, the get requests
+        are performed concurrently on the event loop.
+        """
+        if not self._ops_mask & _GET_MANY_BIT:
+            raise OperationNotEnabled
+
+        if not self._batch_path:
+            get_kwargs = self._make_get_many_kwargs(ids, kwargs)
+
+            return list(await asyncio.gather(*(
+                self.get(**pk_kwargs) for pk_kwargs in get_kwargs
+            )))
+
+        body = dict(kwargs)
+        body['ids'] = list(ids)
+
+        sent, request = await self._send(
+            self._http_client.post,
+            self._batch_url,
+            content=orjson.dumps(body),
+            headers=self._get_json_headers(),
+        )
+        if not sent:
+            return None
+
+        if not request.is_success:
+            self._handle_api_error(request)
+
+        data = orjson.loads(request.content)
+        return [self._build_resource(obj) for obj in data]
+
+    async def put(self, obj, return_resource=None, as_json=None, **kwargs):
+        """See ResourceClient.put"""
+        if not self._ops_mask & _PUT_BIT:
+            raise OperationNotEnabled
+
+        if not return_resource:
+            return_resource = self.meta.default_return_resource
+
+        url, kwargs = self._make_url(kwargs, obj)
+
+        # as_json can only enable JSON, the default is used otherwise
+        put_impl = self._put_as_json if as_json else self._put_impl
+
+        sent, request = await put_impl(url, obj, kwargs)
+        if not sent:
+            return False
+
+        if not request.is_success:
+            self._handle_api_error(request)
+
+        if return_resource:
+            return return_resource(**orjson.loads(request.content))
+
+        return True
+
+    async def _put_as_json(self, url: str, obj,
+                           params: dict) -> Tuple[bool,
+                                                  Optional[httpx.Response]]:
+        """Sends the resource as a JSON body, see put"""
+        return await self._send(
+            self._http_client.post,
+            url,
+            params=params,
+            headers=self._get_json_headers(),
+            content=orjson.dumps(obj.to_api()),
+        )
+
+    async def _put_as_form(self, url: str, obj,
+                           params: dict) -> Tuple[bool,
+                                                  Optional[httpx.Response]]:
+        """Sends the resource as form data, see put"""
+        return await self._send(
+            self._http_client.post,
+            url,
+            params=params,
+            headers=self._get_auth_headers(),
+            data=obj.to_api(),
+        )
+
+    async def delete(self, obj=None, **kwargs):
+        """See ResourceClient.delete"""
+        if not self._ops_mask & _DELETE_BIT:
+            raise OperationNotEnabled
+
+        url, kwargs = self._make_url(kwargs, obj)
+
+        sent, request = await self._send(
+            self._http_client.delete,
+            url,
+            params=kwargs,
+            headers=self._get_auth_headers(),
+        )
+        if not sent:
+            return False
+
+        return request.is_success
+
+
+class AsyncCollectionClient(_AsyncClientMixin, CollectionClient):
+    """Async API client for collections. The stream Meta option is not
+    supported, responses are always parsed in one go.
+    """
+
+    def __init__(self, session: httpx.AsyncClient = None):
+        super(AsyncCollectionClient, self).__init__(session)
+
+        self._init_async(session)
+
+    def contribute_to_class(self, cls, name):
+        """This configures the client to the specific collection class"""
+        super(AsyncCollectionClient, self).contribute_to_class(cls, name)
+
+        self._timeout = _make_timeout(self._timeout)
+
+    async def get(self, **kwargs):
+        """See CollectionClient.get"""
+        if not self.path:
+            raise OperationNotEnabled
+
+        url, kwargs = self._make_url(kwargs)
+        headers = self._get_auth_headers()
+
+        cache_key, collection = self._get_cached(url, kwargs, headers)
+        if collection is not None:
+            return collection
+
+        sent, request = await self._send(
+            self._get_get_method(),
+            url,
+            headers=headers,
+            **{self._get_body_arg: kwargs}
+        )
+        if not sent:
+            return None
+
+        if not request.is_success:
+            self._handle_api_error(request)
+
+        collection = self.meta.collection(orjson.loads(request.content))
+        self._store_cached(cache_key, collection)
+
+        return collection
@@ -1,28 +1,226 @@
-from typing import Tuple
-from urllib.parse import urljoin
-
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from operator import or_
+from string import Formatter
+from types import MappingProxyType
+from typing import Callable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import ijson
+import orjson
 import requests
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
-from requests.exceptions import ConnectionError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
 
 from .operations import Operations
 from .exceptions import ApiError, OperationNotEnabled
 
 
+class _NoCookiesPolicy(DefaultCookiePolicy):
+    """Cookie policy that never stores or sends cookies"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def _make_session() -> requests.Session:
+    """Creates a session with a connection pool, so sockets to the API host
+    are kept alive and reused between requests.
+
+    As the session is shared by all clients (and thus all users of a Django
+    process), it doesn't keep cookies between requests, like the plain
+    requests API. Supply a session of your own to a client to use cookies.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(_NoCookiesPolicy())
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+# Shared by all clients by default, the pool is keyed per host anyway
+_shared_session = _make_session()
+
+# Used by get_many without a batch_path, created on first use
+_get_many_executor = None
+_get_many_executor_lock = threading.Lock()
+
+
+def _get_get_many_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool shared by all get_many calls"""
+    global _get_many_executor
+
+    if _get_many_executor is None:
+        with _get_many_executor_lock:
+            if _get_many_executor is None:
+                _get_many_executor = ThreadPoolExecutor(max_workers=8)
+
+    return _get_many_executor
+
+# Bits used in ResourceClient._ops_mask for the enabled operations
+_GET_BIT = 1
+_GET_OVER_POST_BIT = 2
+_DELETE_BIT = 4
+_PUT_BIT = 8
+_GET_MANY_BIT = 16
+
+_OP_BITS = {
+    Operations.get: _GET_BIT,
+    Operations.get_over_post: _GET_OVER_POST_BIT,
+    Operations.delete: _DELETE_BIT,
+    Operations.put: _PUT_BIT,
+    Operations.get_many: _GET_MANY_BIT,
+}
+
+# Exceptions raised for specific error status codes, see _handle_api_error
+_STATUS_EXCEPTIONS = {
+    404: ObjectDoesNotExist,
+}
+
+# Shared by all clients that don't send any auth headers
+_NO_AUTH_HEADERS = MappingProxyType({})
+
+
 class BaseClient:
     """
     This class provides common instance attributes and methods for both the
     Collection and Resource clients.
     """
 
-    def __init__(self):
+    def __init__(self, session: requests.Session = None):
+        """
+        :param session: An optional requests session to use instead of the
+        shared, pooled one. Mostly useful for testing.
+        """
         self.path = None
         self.path_variables = []
         self.meta = None
 
-        self._http_client = requests
+        self._http_client = session or _shared_session
         self._host = '' # TODO: Add (better) config options
+        self._path_var_order = []
+        self._path_var_set = frozenset()
+        self._static_url = None
+        self._format_url = None
+        self._get_method = None
+        self._auth_headers_cache = None
+        self._auth_headers_expiry = 0
+        # A (auth headers, json headers) tuple, so it's replaced atomically
+        self._json_headers_cache = (None, None)
+        self._timeout = None
+
+    def _compile_path(self) -> None:
+        """Generates a function that creates the full URL from the path
+        variable values, so _make_url doesn't need to parse the path or join
+        it with the host on every request. The function takes the values in
+        the order of self._path_var_order.
+
+        The path is parsed like str.format would, so escaped braces ('{{' and
+        '}}'), conversions and format specs (like '{pk:03d}') are supported.
+        Positional, attribute and index fields, as well as nested replacement
+        fields in format specs, are not.
+
+        Should be called after self.path has been configured.
+        """
+        if not self.path:
+            return
+
+        prefix = self._make_host_prefix(self.path)
+        path = self.path.lstrip('/') if prefix else self.path
+        self._static_url = prefix + path
+        self._path_var_set = frozenset(self.path_variables)
+
+        if not self.path_variables:
+            return
+
+        try:
+            parsed = list(Formatter().parse(path))
+        except ValueError as e:
+            raise ImproperlyConfigured(
+                'Invalid path {!r}: {}'.format(self.path, e)
+            )
+
+        var_order = []
+        pieces = [repr(prefix)] if prefix else []
+        for literal, field_name, format_spec, conversion in parsed:
+            if literal:
+                pieces.append(repr(literal))
+
+            if field_name is None:
+                continue
+
+            if not field_name.isidentifier() or \
+                    conversion not in (None, 'r', 's', 'a') or \
+                    '{' in format_spec or '}' in format_spec:
+                raise ImproperlyConfigured(
+                    'Unsupported replacement field {!r} in path {!r}'.format(
+                        field_name,
+                        self.path
+                    )
+                )
+
+            arg = '_v{}'.format(len(var_order))
+            var_order.append(field_name)
+
+            if conversion:
+                arg = {'r': 'repr', 's': 'str', 'a': 'ascii'}[conversion] + \
+                      '({})'.format(arg)
+
+            if format_spec:
+                pieces.append('format({}, {!r})'.format(arg, format_spec))
+            elif conversion:
+                pieces.append(arg)
+            else:
+                pieces.append('str({})'.format(arg))
+
+        self._path_var_order = var_order
+
+        namespace = {}
+        exec(
+            'def _format_url({}):\n    return {}'.format(
+                ', '.join('_v{}'.format(i) for i in range(len(var_order))),
+                ' + '.join(pieces) or "''"
+            ),
+            namespace
+        )
+        self._format_url = namespace['_format_url']
+
+    def _configure_get(self, over_post: bool) -> None:
+        """Selects the http method used for get operations once, so it
+        doesn't need to be looked up on every request.
+
+        :param over_post: If the get should be sent as a POST request
+        """
+        self._get_method = self._http_client.get
+        if over_post:
+            self._get_method = self._http_client.post
+
+    def _make_host_prefix(self, path: str) -> str:
+        """Returns the string to prepend to (the stripped) path to create a
+        full URL. This is the host with a trailing slash, or an empty string if
+        there's no host or the path already contains one.
+
+        :param path: The path the prefix will be used for
+        :return:
+        """
+        if not self._host or urlparse(path).scheme:
+            return ''
+
+        if self._host.endswith('/'):
+            return self._host
+
+        return self._host + '/'
 
     @staticmethod
     def _make_auth_headers() -> dict:
@@ -37,59 +235,133 @@ class BaseClient:
 
         return headers
 
-    @staticmethod
-    def _handle_api_error(request: requests.Response) -> None:
-        """Common function to handle API errors
+    def _get_auth_headers(self) -> Mapping:
+        """Returns the headers made by _make_auth_headers. If an auth_ttl is
+        configured in the Meta class, they are reused for that many seconds.
+        Otherwise _make_auth_headers is called for every request.
+
+        Note that cached headers are shared by all threads using this client,
+        so only enable auth_ttl for headers that don't depend on the current
+        user/request. The returned mapping may be shared between requests, so
+        don't modify it.
+
+        :return:
+        """
+        if time.monotonic() < self._auth_headers_expiry:
+            return self._auth_headers_cache
+
+        if type(self)._make_auth_headers is BaseClient._make_auth_headers:
+            # The default never changes, so there's no need to expire it
+            self._auth_headers_cache = _NO_AUTH_HEADERS
+            self._auth_headers_expiry = float('inf')
+            return self._auth_headers_cache
+
+        headers = self._make_auth_headers() or _NO_AUTH_HEADERS
+
+        auth_ttl = getattr(self.meta, 'auth_ttl', 0)
+        if auth_ttl:
+            self._auth_headers_cache = headers
+            self._auth_headers_expiry = time.monotonic() + auth_ttl
+
+        return headers
+
+    def _get_json_headers(self) -> Mapping:
+        """Returns the auth headers, combined with a JSON content type. Like
+        _get_auth_headers, the mapping is reused until the auth headers change.
+
+        :return:
+        """
+        auth_headers = self._get_auth_headers()
+
+        source, json_headers = self._json_headers_cache
+        if auth_headers is not source:
+            headers = dict(auth_headers)
+            headers['Content-Type'] = 'application/json'
+            json_headers = MappingProxyType(headers)
+            self._json_headers_cache = (auth_headers, json_headers)
+
+        return json_headers
+
+    def _send(self, method: Callable, url: str, *args,
+              **kwargs) -> Tuple[bool, Optional[requests.Response]]:
+        """Performs a request using one of the http client's methods, with the
+        timeout configured in the Meta class.
+
+        :param method: The http client method to call, like
+        self._http_client.get
+        :param url: The URL to send the request to
+        :param args: Any additional args for the method
+        :param kwargs: Any additional kwargs for the method
+        :return: A tuple of a bool indicating if the request could be sent, and
+        the response (or None if it could not be sent)
+        """
+        try:
+            return True, method(url, *args, timeout=self._timeout, **kwargs)
+        except (ConnectionError, Timeout):
+            return False, None
+
+    def _handle_api_error(self, request: requests.Response) -> None:
+        """Common function to handle API errors. Raises the exception mapped
+        to the status code in _STATUS_EXCEPTIONS, or an ApiError otherwise.
+        Cached auth headers are discarded if they were rejected.
         :param request:
         :return:
         """
-        if request.status_code == 404:
-            raise ObjectDoesNotExist
+        if request.status_code in (401, 403):
+            self._auth_headers_expiry = 0
+
+        exception = _STATUS_EXCEPTIONS.get(request.status_code)
+        if exception:
+            raise exception
 
         raise ApiError(request.status_code, request.text)
 
-    def _make_url(self, res=None, **kwargs) -> Tuple[str, dict]:
-        """This method takes the resource path, uses string format to inject
-        path variables and combines it with the host to create the full URI for
-        the request
+    def _make_url(self, kwargs: Mapping, res=None) -> Tuple[str, dict]:
+        """This method takes the resource path, injects the path variables
+        and combines it with the host to create the full URI for the request
 
-        :param res: A resource object to get path variable values from
         :param kwargs: All kwargs for this operation call, to get path variables
-        :return: A fully qualified URI to be used in the http request
+        :param res: A resource object to get path variable values from
+        :return: A fully qualified URI to be used in the http request, and the
+        kwargs that are not used as path variables. The supplied kwargs are not
+        modified.
         """
-        url = self.path
-        if self.path_variables:
-            values = {}
-            for path_var in self.path_variables:
-                if res and path_var in self.meta.fields:
-                    value = getattr(res, path_var)
-                    value = self.meta.fields[path_var].clean(value)
-                    values[path_var] = value
-                elif path_var in kwargs:
-                    values[path_var] = kwargs.pop(path_var)
-                else:
-                    raise RuntimeError(
-                        'No value found for path variable {}'.format(path_var)
-                    )
+        if not self.path_variables:
+            return self._static_url, kwargs
 
-            url = url.format(**values)
+        fields = self.meta.fields
+        try:
+            values = [
+                kwargs[var] if res is None or var not in fields else
+                fields[var].clean(getattr(res, var))
+                for var in self._path_var_order
+            ]
+        except KeyError as e:
+            raise RuntimeError(
+                'No value found for path variable {}'.format(e.args[0])
+            )
 
-        return urljoin(self._host, url), kwargs
+        path_var_set = self._path_var_set
+        kwargs = {
+            k: v for k, v in kwargs.items() if k not in path_var_set
+        }
+
+        return self._format_url(*values), kwargs
 
 
 class ResourceClient(BaseClient):
     """Default API client for resources"""
 
-    def __init__(self):
-        super(ResourceClient, self).__init__()
+    def __init__(self, session: requests.Session = None):
+        super(ResourceClient, self).__init__(session)
 
         self.supported_operations = None
-        self._get_enabled = False
-        self._get_over_post_enabled = False
-        self._delete_enabled = False
-        self._update_enabled = False
-        self._put_enabled = False
+        self._ops_mask = 0
         self._send_as_json = False
+        self._batch_path = None
+        self._batch_url = None
+        self._build_resource = None
+        self._put_impl = None
 
     def contribute_to_class(self, cls, _) -> None:
         """This configures the client to the specific resource class"""
@@ -99,37 +371,93 @@ class ResourceClient(BaseClient):
         self.meta = meta
         self.supported_operations = meta.supported_operations
         self._send_as_json = meta.default_send_as_json
+        self._put_impl = self._put_as_json if self._send_as_json else \
+            self._put_as_form
+        self._batch_path = meta.batch_path
+        self._batch_url = self._batch_path
+        if self._batch_path and self._make_host_prefix(self._batch_path):
+            self._batch_url = self._make_host_prefix(self._batch_path) + \
+                self._batch_path.lstrip('/')
+        self._timeout = meta.timeout
+        # Fields are added to the resource after the client is configured, so
+        # the builder is generated on first use
+        self._build_resource = self._compile_resource_builder
 
         # The rest is irrelevant if we don't have a path configured
         if not self.path:
             return
 
-        # Looping like this feels faster than 5 'x in self.supported_operations'
-        # calls
-        for operation in self.supported_operations:
-            if not isinstance(operation, Operations):
-                raise ImproperlyConfigured("Invalid operation supplied!")
-
-            if operation == Operations.get:
-                self._get_enabled = True
-            elif operation == Operations.get_over_post:
-                self._get_over_post_enabled = True
-            elif operation == Operations.delete:
-                self._delete_enabled = True
-            elif operation == Operations.put:
-                self._put_enabled = True
-            else:
-                raise NotImplementedError(
-                    "Operation not implemented! Please add operation '{}' "
-                    "support!".format(
-                        operation.name
-                    )
+        self._compile_path()
+
+        if not all(isinstance(operation, Operations) for operation in
+                   self.supported_operations):
+            raise ImproperlyConfigured("Invalid operation supplied!")
+
+        unknown = set(self.supported_operations) - _OP_BITS.keys()
+        if unknown:
+            raise NotImplementedError(
+                "Operation not implemented! Please add operation '{}' "
+                "support!".format(
+                    unknown.pop().name
                 )
+            )
+
+        # Makes checking if an operation is enabled a single int-AND
+        self._ops_mask = reduce(
+            or_,
+            (_OP_BITS[operation] for operation in self.supported_operations),
+            0
+        )
 
-        if self._get_enabled and self._get_over_post_enabled:
+        both_gets = _GET_BIT | _GET_OVER_POST_BIT
+        if self._ops_mask & both_gets == both_gets:
             raise ImproperlyConfigured(
                 "Resources cannot have both get and get_over_post configured!")
 
+        if self._ops_mask & _GET_MANY_BIT and not self._batch_path and \
+                not self._ops_mask & both_gets:
+            raise ImproperlyConfigured(
+                "Resources need a batch_path, or get or get_over_post "
+                "configured, to support get_many!")
+
+        self._configure_get(bool(self._ops_mask & _GET_OVER_POST_BIT))
+
+    def _compile_resource_builder(self, data: dict):
+        """Generates a function that creates a resource from a dict, with
+        straight-line field assignments instead of Resource.__init__'s generic
+        field loop. It replaces itself on self._build_resource, and builds the
+        resource for the data supplied on this first call.
+
+        :param data: The decoded JSON object to build a resource from
+        :return: A resource instance
+        """
+        from .resource import Resource
+
+        resource_cls = self.meta.resource
+
+        # Resources with their own constructor need to go through it
+        if resource_cls.__init__ is not Resource.__init__:
+            self._build_resource = lambda d: resource_cls(**d)
+            return self._build_resource(data)
+
+        namespace = {'_R': resource_cls}
+        lines = ['def _build(d):', '    r = _R.__new__(_R)']
+        for i, (name, field) in enumerate(resource_cls._meta.fields.items()):
+            namespace['_c{}'.format(i)] = field.clean
+            namespace['_d{}'.format(i)] = field.default
+            lines.extend([
+                '    if {!r} in d:'.format(name),
+                '        r.{} = _c{}(d[{!r}])'.format(name, i, name),
+                '    else:',
+                '        r.{} = _d{}'.format(name, i),
+            ])
+        lines.append('    return r')
+
+        exec('\n'.join(lines), namespace)
+
+        self._build_resource = namespace['_build']
+        return self._build_resource(data)
+
     def get(self, **kwargs):
         """Gets a resource from the API. Either over GET or GET_OVER_POST,
         depending on configuration.
@@ -141,28 +469,105 @@ class ResourceClient(BaseClient):
         :param kwargs: Any additional info to be sent.
         :return:
         """
-        if not self._get_enabled and not self._get_over_post_enabled:
+        if not self._ops_mask & (_GET_BIT | _GET_OVER_POST_BIT):
             raise OperationNotEnabled
 
-        method = self._http_client.get
-        if self._get_over_post_enabled:
-            method = self._http_client.post
+        return self._get(kwargs, self._get_auth_headers())
 
-        url, kwargs = self._make_url(**kwargs)
+    def _get(self, kwargs: dict, headers: Mapping):
+        """Performs the actual get request, see get
 
-        try:
-            request = method(
-                url,
-                kwargs,
-                headers=self._make_auth_headers(),
-            )
-        except ConnectionError:
+        :param kwargs: Any additional info to be sent.
+        :param headers: The (auth) headers to send
+        :return:
+        """
+        url, kwargs = self._make_url(kwargs)
+
+        sent, request = self._send(
+            self._get_method,
+            url,
+            kwargs,
+            headers=headers,
+        )
+        if not sent:
             return None
 
-        if request.ok:
-            return self.meta.resource(**request.json())
+        if not request.ok:
+            self._handle_api_error(request)
+
+        return self._build_resource(orjson.loads(request.content))
+
+    def get_many(self, ids, **kwargs) -> List:
+        """Gets multiple resources from the API.
+
+        If a batch_path is configured, the ids are sent in a single POST
+        request as a JSON body ({"ids": [...], **kwargs}), and the API is
+        expected to return a JSON list of resources.
+
+        Otherwise, a get request is performed for every id concurrently, on a
+        shared thread pool. The id will be supplied to get as the resource's
+        identifier_field kwarg, together with any other kwargs. The auth
+        headers are made once, in the calling thread.
+
+        :param ids: The identifiers of the resources to retrieve
+        :param kwargs: Any additional info to be sent.
+        :return: A list of resources. When using the batch_path, None is
+        returned on a connection error. Otherwise, the list contains None for
+        every id that could not be retrieved due to a connection error.
+        """
+        if not self._ops_mask & _GET_MANY_BIT:
+            raise OperationNotEnabled
+
+        if not self._batch_path:
+            get_kwargs = self._make_get_many_kwargs(ids, kwargs)
+            headers = self._get_auth_headers()
+
+            return list(_get_get_many_executor().map(
+                lambda pk_kwargs: self._get(pk_kwargs, headers),
+                get_kwargs
+            ))
+
+        body = dict(kwargs)
+        body['ids'] = list(ids)
+
+        sent, request = self._send(
+            self._http_client.post,
+            self._batch_url,
+            data=orjson.dumps(body),
+            headers=self._get_json_headers(),
+        )
+        if not sent:
+            return None
+
+        if not request.ok:
+            self._handle_api_error(request)
+
+        data = orjson.loads(request.content)
+        return [self._build_resource(obj) for obj in data]
+
+    def _make_get_many_kwargs(self, ids, kwargs: dict) -> List[dict]:
+        """Creates the kwargs for each get call made by get_many, when no
+        batch_path is configured.
+
+        :param ids: The identifiers of the resources to retrieve
+        :param kwargs: The additional kwargs supplied to get_many
+        :return: A list of kwargs dicts, one for every id
+        """
+        identifier = self.meta.identifier_field
+
+        if identifier in kwargs:
+            raise TypeError(
+                "get_many() got '{}' as a keyword argument, please supply "
+                "identifiers in ids instead".format(identifier)
+            )
 
-        self._handle_api_error(request)
+        get_kwargs = []
+        for pk in ids:
+            pk_kwargs = dict(kwargs)
+            pk_kwargs[identifier] = pk
+            get_kwargs.append(pk_kwargs)
+
+        return get_kwargs
 
     def put(self, obj, return_resource=None, as_json=None, **kwargs):
         """Posts a resource to the API. Please note that while it's called put,
@@ -187,42 +592,50 @@ class ResourceClient(BaseClient):
         :return: A return_response instance, or a Boolean (False indicated
         a connection error)
         """
-        if not self._put_enabled:
+        if not self._ops_mask & _PUT_BIT:
             raise OperationNotEnabled
 
         if not return_resource:
             return_resource = self.meta.default_return_resource
 
-        if not as_json:
-            as_json = self._send_as_json
+        url, kwargs = self._make_url(kwargs, obj)
 
-        url, kwargs = self._make_url(obj, **kwargs)
+        # as_json can only enable JSON, the default is used otherwise
+        put_impl = self._put_as_json if as_json else self._put_impl
 
-        try:
-            request_kwargs = {
-                'params': kwargs,
-                'headers': self._make_auth_headers(),
-            }
+        sent, request = put_impl(url, obj, kwargs)
+        if not sent:
+            return False
 
-            if as_json:
-                request_kwargs['json'] = obj.to_api()
-            else:
-                request_kwargs['data'] = obj.to_api()
+        if not request.ok:
+            self._handle_api_error(request)
 
-            request = self._http_client.post(
-                url,
-                **request_kwargs
-            )
-        except ConnectionError:
-            return False
+        if return_resource:
+            return return_resource(**orjson.loads(request.content))
 
-        if request.ok:
-            if return_resource:
-                return return_resource(**request.json())
+        return True
 
-            return True
+    def _put_as_json(self, url: str, obj,
+                     params: dict) -> Tuple[bool, Optional[requests.Response]]:
+        """Sends the resource as a JSON body, see put"""
+        return self._send(
+            self._http_client.post,
+            url,
+            params=params,
+            headers=self._get_json_headers(),
+            data=orjson.dumps(obj.to_api()),
+        )
 
-        self._handle_api_error(request)
+    def _put_as_form(self, url: str, obj,
+                     params: dict) -> Tuple[bool, Optional[requests.Response]]:
+        """Sends the resource as form data, see put"""
+        return self._send(
+            self._http_client.post,
+            url,
+            params=params,
+            headers=self._get_auth_headers(),
+            data=obj.to_api(),
+        )
 
     def delete(self, obj=None, **kwargs):
         """Performs a delete operation.
@@ -231,18 +644,18 @@ class ResourceClient(BaseClient):
         :param kwargs: Any additional http parameters to sent
         :return: a bool indicating if the request was executed successfully
         """
-        if not self._delete_enabled:
+        if not self._ops_mask & _DELETE_BIT:
             raise OperationNotEnabled
 
-        url, kwargs = self._make_url(obj, **kwargs)
+        url, kwargs = self._make_url(kwargs, obj)
 
-        try:
-            request = self._http_client.delete(
-                url,
-                params=kwargs,
-                headers=self._make_auth_headers(),
-            )
-        except ConnectionError:
+        sent, request = self._send(
+            self._http_client.delete,
+            url,
+            params=kwargs,
+            headers=self._get_auth_headers(),
+        )
+        if not sent:
             return False
 
         return request.ok
@@ -260,10 +673,13 @@ class ResourceClient(BaseClient):
 class CollectionClient(BaseClient):
     """Default API client for resources"""
 
-    def __init__(self):
-        super(CollectionClient, self).__init__()
+    def __init__(self, session: requests.Session = None):
+        super(CollectionClient, self).__init__(session)
 
         self.operation = None
+        self._cache = {}
+        self._cache_ttl = 0
+        self._stream = False
 
     def contribute_to_class(self, cls, _):
         """This configures the client to the specific collection class"""
@@ -272,12 +688,82 @@ class CollectionClient(BaseClient):
         self.path_variables = meta.path_variables
         self.meta = meta
         self.operation = meta.operation
+        self._cache = {}
+        self._cache_ttl = meta.cache_ttl
+        self._stream = meta.stream
+        self._timeout = meta.timeout
+        self._compile_path()
 
         if not self.operation == Operations.get and \
                 not self.operation == Operations.get_over_post:
             raise ImproperlyConfigured(
                 "Collections only support get and get_over_post operations!")
 
+        self._configure_get(self.operation == Operations.get_over_post)
+
+    def _get_cached(self, url: str, kwargs: dict,
+                    headers: Mapping) -> Tuple[Optional[tuple],
+                                               Optional[object]]:
+        """Looks up a collection in the cache, if caching is enabled. The auth
+        headers are part of the key, so collections fetched with one user's
+        credentials are never returned for another's.
+
+        :param url: The URL of the request
+        :param kwargs: The kwargs sent to the API
+        :param headers: The auth headers sent to the API
+        :return: A tuple of the cache key (None if the request can't be
+        cached) and the cached collection (None if there is none)
+        """
+        if not self._cache_ttl:
+            return None, None
+
+        try:
+            cache_key = (
+                url,
+                tuple(sorted(kwargs.items())),
+                tuple(sorted(headers.items())),
+            )
+            cached = self._cache.get(cache_key)
+        except TypeError:
+            # Unhashable parameters, we simply don't cache those
+            return None, None
+
+        if cached and time.monotonic() - cached[0] < self._cache_ttl:
+            return cache_key, cached[1]
+
+        return cache_key, None
+
+    def _store_cached(self, cache_key: Optional[tuple], collection) -> None:
+        """Stores the parsed collection, as parsing is the expensive part.
+        Expired entries are removed from the cache at the same time.
+
+        :param cache_key: The key returned by _get_cached
+        :param collection: The collection to store
+        """
+        if not cache_key:
+            return
+
+        cache = self._cache
+        now = time.monotonic()
+
+        # Re-insert, so the cache stays ordered by the time entries were stored
+        cache.pop(cache_key, None)
+        cache[cache_key] = (now, collection)
+
+        # Remove expired entries, which are always the oldest ones. Another
+        # thread may remove the same entries concurrently, so the oldest entry
+        # can be gone already by the time it's looked up.
+        while cache:
+            try:
+                oldest_key = next(iter(cache))
+            except (StopIteration, RuntimeError):
+                # Emptied or changed by another thread while iterating
+                break
+            oldest = cache.get(oldest_key)
+            if oldest is not None and now - oldest[0] < self._cache_ttl:
+                break
+            cache.pop(oldest_key, None)
+
     def get(self, **kwargs):
         """Gets a collection from the API. Either over GET or GET_OVER_POST,
         depending on configuration.
@@ -292,28 +778,59 @@ class CollectionClient(BaseClient):
         if not self.path:
             raise OperationNotEnabled
 
-        method = self._http_client.get
-        if self.operation == Operations.get_over_post:
-            method = self._http_client.post
+        url, kwargs = self._make_url(kwargs)
+        headers = self._get_auth_headers()
 
-        url, kwargs = self._make_url(**kwargs)
+        cache_key, collection = self._get_cached(url, kwargs, headers)
+        if collection is not None:
+            return collection
 
-        try:
-            request = method(
-                url,
-                kwargs,
-                headers=self._make_auth_headers(),
-            )
-        except ConnectionError as e:
+        sent, request = self._send(
+            self._get_method,
+            url,
+            kwargs,
+            headers=headers,
+            stream=self._stream,
+        )
+        if not sent:
             return None
 
-        if request.ok:
-            return self.meta.collection(request.json())
+        if self._stream:
+            collection = self._read_stream(request)
+            if collection is None:
+                return None
+        else:
+            if not request.ok:
+                self._handle_api_error(request)
+
+            collection = self.meta.collection(orjson.loads(request.content))
+
+        self._store_cached(cache_key, collection)
+
+        return collection
 
-        if request.status_code == 404:
-            raise ObjectDoesNotExist
+    def _read_stream(self, request: requests.Response):
+        """Creates a collection from a streamed response, while it's being
+        downloaded. The response is always closed afterwards, so its
+        connection is returned to the pool.
 
-        self._handle_api_error(request)
+        :param request: A response requested with stream=True
+        :return: The collection, or None on a connection error or timeout
+        while reading the body
+        """
+        try:
+            if not request.ok:
+                self._handle_api_error(request)
+
+            # Let urllib3 handle any content-encoding for us
+            request.raw.decode_content = True
+            items = ijson.items(request.raw, 'item', use_float=True)
+
+            return self.meta.collection(items)
+        except (ReadTimeoutError, ProtocolError, ConnectionError, Timeout):
+            return None
+        finally:
+            request.close()
 
     def __str__(self):
         return '{} client for collection {}'.format(
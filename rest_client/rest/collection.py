@@ -69,10 +69,30 @@ class ResourceCollection(_CollectionMixin, metaclass=ResourceCollectionMetaclass
             path = "/item/{pk}/"
             path_variables = ['pk']
 
+      The path follows str.format syntax, see Resource for details.
+
     - operation (optional): Whether to use GET or GET_OVER_POST
       Defaults to GET. Does not affect anything if no path is specified.
     - client_class (optional): You can use this variable to specify a different
       client.
+    - cache_ttl (optional): The number of seconds a retrieved collection may be
+      reused for identical get calls, meaning the same URL, parameters and
+      auth headers. Defaults to 0, which disables caching.
+      Please note that every caller gets the same collection object, and thus
+      the same resource instances. Cached resources are shared and must not be
+      modified.
+    - stream (optional): If True, the response is parsed while it's being
+      downloaded, creating the resources one at a time. This avoids keeping
+      the whole response body and its parsed JSON in memory for large
+      collections. Defaults to False.
+    - auth_ttl (optional): The number of seconds the client reuses the headers
+      returned by it's _make_auth_headers method. Defaults to 0, which calls
+      _make_auth_headers for every request. Cached headers are shared between
+      threads, so don't use this for per-user headers. They are discarded when
+      the API responds with 401 or 403.
+    - timeout (optional): The timeout for requests in seconds, either a single
+      number or a (connect, read) tuple. A request that times out is handled
+      like a connection error. Defaults to None, which means no timeout.
     """
     _meta = None
 
@@ -84,10 +104,9 @@ class ResourceCollection(_CollectionMixin, metaclass=ResourceCollectionMetaclass
             return
 
         try:
-            objects = list(values)
-
+            # Values may be a (streaming) iterator, so we don't copy it first
             if is_json:
-                self._items = [opts.resource(**obj) for obj in objects if not
+                self._items = [opts.resource(**obj) for obj in values if not
                 isinstance(obj, int)]
             else:
                 self._items = values
@@ -124,10 +143,10 @@ class _TypeCollection(_CollectionMixin, metaclass=TypeCollectionMetaclass):
             return
 
         try:
-            objects = list(values)
-
             if is_json:
-                self._items = [self.type(obj) for obj in objects if not
+                # Look up the type once, instead of once per item
+                cast = self.type
+                self._items = [cast(obj) for obj in values if not
                                isinstance(obj, int)]
             else:
                 self._items = values
@@ -1,16 +1,20 @@
 class ApiError(Exception):
     """General API errors"""
 
-    def __init__(self, status_code, message, *args):
+    def __init__(self, status_code: int, message: str, *args):
         super(ApiError, self).__init__(*args)
         self.status_code = status_code
         self.message = message
 
+        # Errors are often stringified more than once (logging, reporting)
+        self._str = f'ApiError ({status_code}): {message}'
+        self._repr = f"<ApiError ({status_code}): '{message}'>"
+
     def __str__(self):
-        return 'ApiError ({}): {}'.format(self.status_code, self.message)
+        return self._str
 
     def __repr__(self):
-        return "<ApiError ({}): '{}'>".format(self.status_code, self.message)
+        return self._repr
 
 
 class OperationNotEnabled(Exception):
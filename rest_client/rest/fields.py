@@ -1,4 +1,4 @@
-import collections
+import collections.abc
 from abc import ABC, abstractmethod
 from datetime import date, datetime, time
 from functools import total_ordering
@@ -59,7 +59,7 @@ class BaseField(ABC):
 
         self.default = default
 
-        if isinstance(choices, collections.Iterator):
+        if isinstance(choices, collections.abc.Iterator):
             choices = list(choices)
         self.choices = choices or []
         self.null = null
@@ -7,4 +7,5 @@ class Operations(Enum):
     delete = 3
     get_over_post = 4  # When request params should be sent over POST instead of
     # GET. Mostly for logging in
+    get_many = 5  # Retrieve multiple resources in one call, see ResourceClient
 
@@ -20,6 +20,9 @@ class ResourceOptions:
         self.client_class = None
         self.default_return_resource = None
         self.default_send_as_json = False
+        self.batch_path = None
+        self.auth_ttl = 0
+        self.timeout = None
         self.app_label = app_label
 
     def contribute_to_class(self, cls, name):
@@ -53,6 +56,10 @@ class ResourceCollectionOptions:
         self.path_variables = []
         self.operation = Operations.get
         self.client_class = None
+        self.cache_ttl = 0
+        self.stream = False
+        self.auth_ttl = 0
+        self.timeout = None
         self.app_label = app_label
 
     def contribute_to_class(self, cls, name):
@@ -88,6 +95,10 @@ class TypeCollectionOptions:
         self.path_variables = []
         self.operation = Operations.get
         self.client_class = None
+        self.cache_ttl = 0
+        self.stream = False
+        self.auth_ttl = 0
+        self.timeout = None
         self.app_label = app_label
 
     def contribute_to_class(self, cls, name):
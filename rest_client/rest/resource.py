@@ -42,12 +42,17 @@ class Resource(metaclass=ResourceMetaclass):
             path = "/item/{pk}/"
             path_variables = ['pk']
 
+      The path follows str.format syntax, so format specs like '{pk:03d}' and
+      escaped braces ('{{' and '}}') can be used. Positional, attribute and
+      index fields (like '{0}' or '{obj.pk}') are not supported, and raise
+      ImproperlyConfigured.
+
     - identifier_field (optional): A string containing the name of the field
       that represents a identifier for this resource. Only used in the default
       __str__ implementation. It's just a helpful thing to have when debugging.
     - supported_operations (optional): A list of operation the API supports for
       this resource. Does not affect anything if no path is specified.
-      Defaults to all operations.
+      Defaults to all operations, except for get_many.
     - client_class (optional): You can use this variable to specify a different
       client.
     - default_return_resource (optional): You can specify a different resource
@@ -55,6 +60,17 @@ class Resource(metaclass=ResourceMetaclass):
       and can be overridden on the operation call itself. See the client
       documentation for more info. If none is supplied, a boolean is returned
       instead.
+    - batch_path (optional): Specifies the REST endpoint location used by the
+      get_many operation to retrieve multiple resources in one request. If not
+      supplied, get_many will instead perform concurrent get requests.
+    - auth_ttl (optional): The number of seconds the client reuses the headers
+      returned by it's _make_auth_headers method. Defaults to 0, which calls
+      _make_auth_headers for every request. Cached headers are shared between
+      threads, so don't use this for per-user headers. They are discarded when
+      the API responds with 401 or 403.
+    - timeout (optional): The timeout for requests in seconds, either a single
+      number or a (connect, read) tuple. A request that times out is handled
+      like a connection error. Defaults to None, which means no timeout.
     """
 
     _meta = None
@@ -100,4 +116,4 @@ class Resource(metaclass=ResourceMetaclass):
 
     def delete(self, **kwargs):
         """Proxy method that autofills the obj parameter"""
-        self.client.delete(self, **kwargs)
\ No newline at end of file
+        return self.client.delete(self, **kwargs)
\ No newline at end of file
@@ -1,3 +1,444 @@
-from django.test import TestCase
+import asyncio
+import io
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import orjson
+import requests
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
+from django.test import SimpleTestCase
+from urllib3 import HTTPResponse
+from urllib3.exceptions import ProtocolError
+
+from .rest import Resource, ResourceCollection, IntegerField, TextField, \
+    Operations
+from .rest.client import ResourceClient, CollectionClient
+
+try:
+    import httpx
+    from .rest.async_client import AsyncResourceClient, AsyncCollectionClient
+except ImportError:
+    httpx = None
+
+
+class Item(Resource):
+    id = IntegerField()
+    name = TextField(default='unnamed')
+
+    class Meta:
+        path = 'item/{id}/'
+        path_variables = ['id']
+        supported_operations = [
+            Operations.get,
+            Operations.put,
+            Operations.delete,
+        ]
+
+
+class CustomItem(Resource):
+    id = IntegerField()
+
+    class Meta:
+        path = 'custom/{id}/'
+        path_variables = ['id']
+
+    def __init__(self, **kwargs):
+        super(CustomItem, self).__init__(**kwargs)
+        self.constructed = True
+
+
+class Items(ResourceCollection):
+    class Meta:
+        resource = Item
+        path = 'items/'
+
+
+class CachedItems(ResourceCollection):
+    class Meta:
+        resource = Item
+        path = 'items/'
+        cache_ttl = 10
+
+
+class StreamedItems(ResourceCollection):
+    class Meta:
+        resource = Item
+        path = 'items/'
+        stream = True
+
+
+def _make_client(cls, client_class, session):
+    """Returns a client of client_class for cls, using the supplied session"""
+    client = client_class(session)
+    client.contribute_to_class(cls, 'client')
+    return client
+
+
+def _make_response(data=None, status_code=200, raw=None):
+    """Returns a requests response with data as the JSON body, or with raw as
+    the (streamed) body if supplied.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    if raw is None:
+        response._content = orjson.dumps(data)
+    else:
+        response.raw = raw
+
+    return response
+
+
+def _make_session(*responses):
+    """Returns a mocked requests session, which returns the responses in order
+    for any request method.
+    """
+    session = mock.Mock(spec=['get', 'post', 'delete'])
+    for method in (session.get, session.post, session.delete):
+        method.side_effect = list(responses)
+
+    return session
+
+
+class _FailingBody(io.RawIOBase):
+    """A response body that breaks off after sending part of the data"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._data:
+            raise ProtocolError('Connection broken')
+
+        size = min(len(buffer), len(self._data))
+        buffer[:size] = self._data[:size]
+        self._data = self._data[size:]
+        return size
+
+
+class ResourceBuilderTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = _make_client(Item, ResourceClient, None)
+
+    def test_matches_resource_init(self):
+        data = {'id': 1, 'name': 'first', 'unknown': True}
+
+        resource = self.client._build_resource(data)
+
+        self.assertIsInstance(resource, Item)
+        self.assertEqual(resource.to_api(), Item(**data).to_api())
+        self.assertFalse(hasattr(resource, 'unknown'))
+
+    def test_missing_keys_use_defaults(self):
+        resource = self.client._build_resource({})
+
+        self.assertIsNone(resource.id)
+        self.assertEqual(resource.name, 'unnamed')
+        self.assertEqual(resource.to_api(), Item().to_api())
+
+    def test_builder_is_reused(self):
+        self.client._build_resource({'id': 1})
+        builder = self.client._build_resource
+
+        self.assertEqual(self.client._build_resource({'id': 2}).id, 2)
+        self.assertIs(self.client._build_resource, builder)
+
+    def test_custom_init_is_called(self):
+        client = _make_client(CustomItem, ResourceClient, None)
+
+        resource = client._build_resource({'id': 3})
+
+        self.assertIsInstance(resource, CustomItem)
+        self.assertEqual(resource.id, 3)
+        self.assertTrue(resource.constructed)
+
+
+class FormatUrlTests(SimpleTestCase):
+
+    def _make_client(self, path, path_variables=(), host=''):
+        client = ResourceClient()
+        client.path = path
+        client.path_variables = list(path_variables)
+        client.meta = Item._meta
+        client._host = host
+        client._compile_path()
+        return client
+
+    def test_static_path(self):
+        client = self._make_client('items/{{all}}/')
+
+        self.assertEqual(
+            client._make_url({'page': 1}),
+            ('items/{{all}}/', {'page': 1})
+        )
+
+    def test_path_variables(self):
+        client = self._make_client('item/{id}/{slug}/', ['id', 'slug'])
+
+        url, kwargs = client._make_url({'id': 1, 'slug': 'a', 'page': 2})
+
+        self.assertEqual(url, 'item/1/a/')
+        self.assertEqual(kwargs, {'page': 2})
+
+    def test_path_variables_from_resource(self):
+        client = self._make_client('item/{id}/', ['id'])
+
+        url, _ = client._make_url({}, Item(id=5))
+
+        self.assertEqual(url, 'item/5/')
+
+    def test_format_specs_and_escapes(self):
+        client = self._make_client('item/{id:03d}/{{id}}/{name!r}/',
+                                   ['id', 'name'])
+
+        url, _ = client._make_url({'id': 7, 'name': 'a'})
+
+        self.assertEqual(url, "item/007/{id}/'a'/")
+        self.assertEqual(
+            url,
+            'item/{id:03d}/{{id}}/{name!r}/'.format(id=7, name='a')
+        )
+
+    def test_host_prefix(self):
+        client = self._make_client('/item/{id}/', ['id'],
+                                   'https://api.test/v1')
+        static = self._make_client('/items/', host='https://api.test/v1/')
+
+        self.assertEqual(client._make_url({'id': 1})[0],
+                         'https://api.test/v1/item/1/')
+        self.assertEqual(static._make_url({})[0], 'https://api.test/v1/items/')
+
+    def test_absolute_path_ignores_host(self):
+        client = self._make_client('https://other.test/item/{id}/', ['id'],
+                                   'https://api.test/')
+
+        self.assertEqual(client._make_url({'id': 1})[0],
+                         'https://other.test/item/1/')
+
+    def test_missing_variable(self):
+        client = self._make_client('item/{id}/', ['id'])
+
+        with self.assertRaises(RuntimeError):
+            client._make_url({})
+
+    def test_unsupported_fields(self):
+        for path in ('item/{0}/', 'item/{id.pk}/', 'item/{id:{width}}/',
+                     'item/{id'):
+            with self.subTest(path=path):
+                with self.assertRaises(ImproperlyConfigured):
+                    self._make_client(path, ['id'])
+
+
+class ResourceClientTests(SimpleTestCase):
+
+    def test_get(self):
+        session = _make_session(_make_response({'id': 1, 'name': 'first'}))
+        client = _make_client(Item, ResourceClient, session)
+
+        resource = client.get(id=1, extra=True)
+
+        self.assertEqual((resource.id, resource.name), (1, 'first'))
+        session.get.assert_called_once_with(
+            'item/1/', {'extra': True}, timeout=None, headers={}
+        )
+
+    def test_get_not_found(self):
+        session = _make_session(_make_response({}, status_code=404))
+        client = _make_client(Item, ResourceClient, session)
+
+        with self.assertRaises(ObjectDoesNotExist):
+            client.get(id=1)
+
+    def test_connection_error(self):
+        session = _make_session(requests.ConnectionError())
+        client = _make_client(Item, ResourceClient, session)
+
+        self.assertIsNone(client.get(id=1))
+
+
+class CollectionCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.session = _make_session(*(
+            _make_response([{'id': i}]) for i in range(5)
+        ))
+        self.client = _make_client(CachedItems, CollectionClient, self.session)
+
+        time_patcher = mock.patch('rest_client.rest.client.time')
+        self.time = time_patcher.start()
+        self.time.monotonic.return_value = 100
+        self.addCleanup(time_patcher.stop)
+
+    def test_hit(self):
+        collection = self.client.get(page=1)
+
+        self.assertIs(self.client.get(page=1), collection)
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_different_params_miss(self):
+        self.client.get(page=1)
+        self.client.get(page=2)
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_different_auth_headers_miss(self):
+        headers = {'Authorization': 'first'}
+        with mock.patch.object(self.client, '_get_auth_headers',
+                               lambda: headers):
+            first = self.client.get()
+            headers = {'Authorization': 'second'}
+            second = self.client.get()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_expiry(self):
+        collection = self.client.get()
+        self.time.monotonic.return_value = 110
+
+        self.assertIsNot(self.client.get(), collection)
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_eviction(self):
+        self.client.get(page=1)
+        self.client.get(page=2)
+        self.time.monotonic.return_value = 110
+        self.client.get(page=3)
+
+        self.assertEqual(len(self.client._cache), 1)
+
+    def test_unhashable_params_are_not_cached(self):
+        self.client.get(ids=[1, 2])
+        self.client.get(ids=[1, 2])
+
+        self.assertEqual(self.session.get.call_count, 2)
+        self.assertEqual(self.client._cache, {})
+
+
+class CollectionStreamTests(SimpleTestCase):
+
+    def test_parse(self):
+        raw = HTTPResponse(
+            body=io.BytesIO(b'[{"id": 1, "name": "a"}, {"id": 2}]'),
+            preload_content=False,
+        )
+        session = _make_session(_make_response(raw=raw))
+        client = _make_client(StreamedItems, CollectionClient, session)
+
+        collection = client.get()
+
+        self.assertEqual([(r.id, r.name) for r in collection],
+                         [(1, 'a'), (2, 'unnamed')])
+        self.assertTrue(session.get.call_args[1]['stream'])
+        self.assertTrue(raw.closed)
+
+    def test_read_error(self):
+        raw = HTTPResponse(
+            body=io.BufferedReader(_FailingBody(b'[{"id": 1}, {"id"')),
+            preload_content=False,
+        )
+        session = _make_session(_make_response(raw=raw))
+        client = _make_client(StreamedItems, CollectionClient, session)
+
+        self.assertIsNone(client.get())
+        self.assertTrue(raw.closed)
+
+    def test_error_status(self):
+        raw = HTTPResponse(body=io.BytesIO(b'Not found'), status=404,
+                           preload_content=False)
+        session = _make_session(_make_response(status_code=404, raw=raw))
+        client = _make_client(StreamedItems, CollectionClient, session)
+
+        with self.assertRaises(ObjectDoesNotExist):
+            client.get()
+        self.assertTrue(raw.closed)
+
+
+@skipUnless(httpx, "The async clients require the 'async' extra")
+class AsyncClientTests(SimpleTestCase):
+
+    def _make_session(self, status_code=200, data=None):
+        """Returns an AsyncClient that responds with data to any request, and
+        the list the requests are added to.
+        """
+        requests_made = []
+
+        def handler(request):
+            requests_made.append(request)
+            return httpx.Response(status_code, json=data)
+
+        session = httpx.AsyncClient(
+            base_url='https://api.test',
+            transport=httpx.MockTransport(handler),
+        )
+        return session, requests_made
+
+    def _run(self, session, coroutine):
+        async def run():
+            async with session:
+                return await coroutine
+
+        return asyncio.run(run())
+
+    def test_get(self):
+        session, requests_made = self._make_session(data={'id': 1})
+        client = _make_client(Item, AsyncResourceClient, session)
+
+        resource = self._run(session, client.get(id=1, extra='yes'))
+
+        self.assertEqual((resource.id, resource.name), (1, 'unnamed'))
+        self.assertEqual(requests_made[0].method, 'GET')
+        self.assertEqual(str(requests_made[0].url),
+                         'https://api.test/item/1/?extra=yes')
+
+    def test_get_not_found(self):
+        session, _ = self._make_session(status_code=404, data={})
+        client = _make_client(Item, AsyncResourceClient, session)
+
+        with self.assertRaises(ObjectDoesNotExist):
+            self._run(session, client.get(id=1))
+
+    def test_put_as_form(self):
+        session, requests_made = self._make_session()
+        client = _make_client(Item, AsyncResourceClient, session)
+
+        result = self._run(session, client.put(Item(id=1, name='a')))
+
+        self.assertTrue(result)
+        self.assertEqual(requests_made[0].method, 'POST')
+        self.assertEqual(requests_made[0].content, b'id=1&name=a')
+
+    def test_put_as_json(self):
+        session, requests_made = self._make_session(data={'id': 1})
+        client = _make_client(Item, AsyncResourceClient, session)
+
+        result = self._run(
+            session,
+            client.put(Item(id=1), return_resource=Item, as_json=True)
+        )
+
+        self.assertEqual(result.id, 1)
+        self.assertEqual(orjson.loads(requests_made[0].content),
+                         {'id': 1, 'name': 'unnamed'})
+        self.assertEqual(requests_made[0].headers['Content-Type'],
+                         'application/json')
+
+    def test_delete(self):
+        session, requests_made = self._make_session()
+        client = _make_client(Item, AsyncResourceClient, session)
+
+        self.assertTrue(self._run(session, client.delete(Item(id=1))))
+        self.assertEqual(requests_made[0].method, 'DELETE')
+        self.assertEqual(str(requests_made[0].url),
+                         'https://api.test/item/1/')
+
+    def test_collection_get(self):
+        session, requests_made = self._make_session(data=[{'id': 1}])
+        client = _make_client(Items, AsyncCollectionClient, session)
+
+        collection = self._run(session, client.get())
+
+        self.assertEqual([r.id for r in collection], [1])
+        self.assertEqual(requests_made[0].method, 'GET')
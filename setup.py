@@ -14,12 +14,19 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/tymees/django-rest-client",
     packages=setuptools.find_packages(),
+    python_requires='>=3.6',
     install_requires=[
         'requests',
+        'orjson',
+        'ijson',
         'pip-tools',
         'django',
         'backports-datetime-fromisoformat',
     ],
+    extras_require={
+        # The async clients require Python 3.7 or later
+        'async': ['httpx[http2]'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Framework :: Django :: 2.1",